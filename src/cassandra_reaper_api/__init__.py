@@ -2,122 +2,442 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import base64
+import functools
+import importlib.util
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from urllib.parse import quote
 
 import requests
-from requests.compat import urljoin
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # no cov
+    httpx = None
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # no cov
+    from json import dumps as json_dumps, loads as json_loads
+
+logger = logging.getLogger(__name__)
+
+# Refresh jwt token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 60
+
+# Endpoint path templates, arguments are url-quoted by _path
+_CLUSTER = "cluster/%s"
+_CLUSTER_TABLES = "cluster/%s/tables"
+_REPAIR = "repair_run/%s"
+_REPAIR_STATE = "repair_run/%s/state/%s"
+_REPAIR_INTENSITY = "repair_run/%s/intensity/%s"
+_REPAIR_SEGMENTS = "repair_run/%s/segments"
+_REPAIR_SEGMENT_ABORT = "repair_run/%s/segments/abort/%s"
+_SCHEDULE = "repair_schedule/%s"
+_CLUSTER_SCHEDULES = "repair_schedule/cluster/%s"
+_SCHEDULE_START = "repair_schedule/start/%s"
+_CLUSTER_SNAPSHOTS = "snapshot/cluster/%s"
+_CLUSTER_SNAPSHOT = "snapshot/cluster/%s/%s"
+_HOST_SNAPSHOTS = "snapshot/%s/%s"
+_HOST_SNAPSHOT = "snapshot/%s/%s/%s"
 
 
 class AuthError(Exception):
     pass
 
 
-class CassandraReaper:
-    def __init__(self, url: str, user: str, password: str, verify_ssl=True, login=True) -> None:
+class BulkError(Exception):
+    """Some items of a bulk operation failed, errors maps each failed item to its exception"""
+
+    def __init__(self, errors: dict) -> None:
+        self.errors = errors
+        super().__init__(f"Failed for {len(errors)} item(s): {', '.join(map(str, errors))}")
+
+
+def _raise_bulk_errors(items: list, results: list) -> None:
+    errors = {item: result for item, result in zip(items, results) if isinstance(result, Exception)}
+    if errors:
+        raise BulkError(errors)
+
+
+def _check_response(req, ok: bool) -> None:
+    """Raise AuthError or HTTPError for a failed requests or httpx response"""
+    if not ok:
+        msg = f"URL: {req.url}, Status: {req.status_code}, Text: {req.text}"
+        if req.status_code in (403, 498, 499):
+            raise AuthError(msg)
+        raise HTTPError(msg, response=req)
+
+
+def _cache_key(query: str, params) -> tuple:
+    return (query, tuple(sorted(params.items())) if params else ())
+
+
+def _path(template: str, *args) -> str:
+    """Fill endpoint path template with url-quoted arguments"""
+    return template % tuple(quote(str(arg), safe='') for arg in args)
+
+
+def _token_ttl(token: str):
+    """Get seconds left until jwt token expiration, None if token has no exp claim"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+    return exp - time.time()
+
+
+def _token_deadline(token: str):
+    """Get monotonic time to refresh jwt token at, None if token has no usable exp claim"""
+    ttl = _token_ttl(token)
+    if ttl is None or ttl <= 0:
+        # Already expired by local clock, likely running ahead of Reaper's,
+        # rely on re-login when Reaper rejects the token instead
+        return None
+    # Monotonic clock so local clock jumps don't matter, short-lived tokens
+    # are refreshed halfway through their lifetime instead of on every call
+    return time.monotonic() + ttl - min(TOKEN_REFRESH_MARGIN, ttl / 2)
+
+
+def _bearer_token(header: str) -> str:
+    """Get token from Authorization header value, empty string if it isn't a bearer one"""
+    scheme, _, token = header.partition(' ')
+    return token.strip() if scheme.lower() == 'bearer' else ''
+
+
+def _snapshot_params(snapshot_name: str, owner: str, cause: str, keyspace: str, tables) -> dict:
+    """Build query params for snapshot creation"""
+    tables_csv = ",".join(tables) if tables else None
+    optional = {'keyspace': keyspace, 'tables': tables_csv, 'cause': cause}
+    params = {'snapshot_name': snapshot_name, 'owner': owner}
+    params.update({k: v for k, v in optional.items() if v})
+    return params
+
+
+def _schedule_params(
+    cluster: str,
+    keyspace: str,
+    owner: str,
+    schedule_days_between: int,
+    segment_count_per_node: int,
+    intensity: float,
+    repair_parallelism: str,
+    repair_thread_count: int,
+    nodes,
+    schedule_trigger_time,
+    datacenters,
+    tables,
+    blacklisted_tables,
+    incremental_repair: bool,
+    adaptive: bool,
+    percent_unrepaired_threshold: int,
+) -> dict:
+    """Build query params for repair schedule creation"""
+    if schedule_trigger_time is None:
+        # Next midnight UTC, evaluated per call rather than at import time
+        schedule_trigger_time = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    params = {
+        'clusterName': cluster,
+        'keyspace': keyspace,
+        'owner': owner,
+        'scheduleDaysBetween': schedule_days_between,
+        'repairParallelism': repair_parallelism,
+        'incrementalRepair': incremental_repair,
+        'scheduleTriggerTime': schedule_trigger_time.isoformat(),
+        'repairThreadCount': repair_thread_count,
+        'adaptive': adaptive,
+        'percentUnrepairedThreshold': percent_unrepaired_threshold,
+    }
+    optional = {
+        'tables': tables,
+        'segmentCountPerNode': segment_count_per_node,
+        'intensity': intensity,
+        'nodes': nodes,
+        'datacenters': datacenters,
+        'blacklistedTables': blacklisted_tables,
+    }
+    params.update({k: v for k, v in optional.items() if v})
+    return params
+
+
+def _schedule_patch_body(
+    owner: str,
+    repair_parallelism: str,
+    intensity: float,
+    scheduled_days_between: int,
+    segment_count_per_node: int,
+    percent_unrepaired_threshold: int,
+    adaptive: bool,
+) -> dict:
+    """Build json body for repair schedule update"""
+    return {
+        'owner': owner,
+        'repair_parallelism': repair_parallelism,
+        'intensity': intensity,
+        'scheduled_days_between': scheduled_days_between,
+        'segment_count_per_node': segment_count_per_node,
+        'percent_unrepaired_threshold': percent_unrepaired_threshold,
+        'adaptive': adaptive,
+    }
+
+
+class _Retry(Retry):
+    """Retry that repeats requests failed with a read error only for GET
+
+    After a read error the request may already be processed, so repeating
+    e.g. a DELETE could turn its success into an error. Read error of the last
+    attempt is raised as is instead of MaxRetryError, so requests still turns
+    a read timeout into ReadTimeout rather than ConnectionError.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        read_error = isinstance(error, (ReadTimeoutError, ProtocolError))
+        retry = self.new(read=False) if read_error and method != 'GET' else self
+        try:
+            return Retry.increment(retry, method, url, response=response, error=error, _pool=_pool,
+                                   _stacktrace=_stacktrace)
+        except MaxRetryError:
+            if read_error:
+                raise error from None
+            raise
+
+
+class _ReaperBase:
+    """Credentials, jwt token and response cache shared by CassandraReaper and AsyncCassandraReaper"""
+
+    def __init__(self, url: str, user: str, password: str) -> None:
         self.url = url
-        self.__s = requests.session()
-        self.__s.verify = verify_ssl
         self.user = user
         self.__password = password
         self.token = ''
+        self.__token_deadline = None
+        self.__cache = {}
+        self.__cache_generation = 0
+
+    def _login_data(self) -> dict:
+        return {'username': self.user,
+                'password': self.__password, 'rememberMe': False}
+
+    def _set_token(self, token: str) -> None:
+        self.token = token
+        self.__token_deadline = _token_deadline(token)
+
+    def _token_expired(self) -> bool:
+        return self.__token_deadline is not None and time.monotonic() > self.__token_deadline
+
+    def _cache_lookup(self, key: tuple, ttl: float):
+        """Get current cache generation and cached body younger than ttl seconds, None if there is no such"""
+        entry = self.__cache.get(key)
+        fresh = entry is not None and time.monotonic() - entry[0] < ttl
+        return self.__cache_generation, entry[1] if fresh else None
+
+    def _cache_store(self, key: tuple, content: bytes, generation: int) -> None:
+        # Skip caching if a write happened while the request was in flight
+        if generation == self.__cache_generation:
+            self.__cache[key] = (time.monotonic(), content)
+
+    def _cache_fallback(self, key: tuple, query: str, error: Exception) -> bytes:
+        """Get stale cached body for a request failed to reach Reaper or with 5xx, error is raised otherwise"""
+        entry = self.__cache.get(key)
+        # 4xx is Reaper's actual answer, e.g. 404 for a cluster since deleted
+        if entry is None or isinstance(error, HTTPError) and error.response.status_code < 500:
+            raise error
+        logger.warning("Returning stale response for %s: %s", query, error)
+        return entry[1]
+
+    def clear_cache(self) -> None:
+        """Drop all cached responses"""
+        # Bumped first so responses to requests in flight aren't cached afterwards
+        self.__cache_generation += 1
+        self.__cache.clear()
+
+    def update_password(self, new_password: str) -> None:
+        self.__password = new_password
+
+
+class CassandraReaper(_ReaperBase):
+    """Cassandra Reaper API client
+
+    Connection errors and 502/503/504 responses are retried, read timeouts
+    only for GET requests. Method timeout applies to every attempt, so a GET
+    may block for up to three times its timeout plus backoff before raising
+    requests' ReadTimeout.
+    """
+
+    def __init__(self, url: str, user: str, password: str, verify_ssl=True, login=True, pool_size=32) -> None:
+        super().__init__(url, user, password)
+        self.__base = url.rstrip('/') + '/'
+        self.__s = requests.session()
+        self.__s.verify = verify_ssl
+        # Size the keep-alive pool for concurrent callers and retry idempotent
+        # requests on connection errors and transient gateway errors
+        retry = _Retry(total=3, connect=2, read=2, status=3, backoff_factor=0.25, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(['GET', 'HEAD', 'PUT', 'DELETE']),
+                      respect_retry_after_header=True, raise_on_status=False)
+        self.__mount(self.__s, retry, pool_size)
+        self.__s.headers['Connection'] = 'keep-alive'
+        # POST and PATCH are retried only when caller marks them idempotent,
+        # such requests go through a session sharing headers and cookies
+        self.__idempotent_s = requests.session()
+        self.__idempotent_s.verify = verify_ssl
+        self.__idempotent_s.headers = self.__s.headers
+        self.__idempotent_s.cookies = self.__s.cookies
+        self.__mount(self.__idempotent_s, retry.new(allowed_methods=None), pool_size)
+        # Bound methods looked up once instead of on every request
+        self.__send = self.__s.request
+        self.__send_idempotent = self.__idempotent_s.request
+        self.__pool_size = pool_size
+        self.__token_lock = threading.Lock()
         if login:
             self.login()
 
+    @staticmethod
+    def __mount(session, retry, pool_size):
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
     def login(self) -> None:
         """Get jwt token"""
-        data = {'username': self.user,
-                'password': self.__password, 'rememberMe': False}
-        login_url = urljoin(self.url, 'login')
-        login_req = self.__s.post(login_url, data=data)
-        self.__check_req(login_req)
-        jwt_url = urljoin(self.url, 'jwt')
-        jwt_req = self.__s.get(jwt_url)
-        self.__check_req(jwt_req)
-        self.token = jwt_req.text
-        self.__s.headers.update({'Authorization': f"Bearer {self.token}"})
-
-    def __check_req(self, req):
-        if not req.ok:
-            msg = f"URL: {req.url}, Status: {req.status_code}, Text: {req.text}"
-            if req.status_code in (403, 498, 499):
-                raise AuthError(msg)
-            raise HTTPError(msg)
+        login_req = self.__s.post(self.__base + 'login', data=self._login_data())
+        _check_response(login_req, login_req.ok)
+        # Newer Reaper versions return the token right away, older ones need a separate request
+        token = _bearer_token(login_req.headers.get('Authorization', ''))
+        if not token:
+            jwt_req = self.__s.get(self.__base + 'jwt')
+            _check_response(jwt_req, jwt_req.ok)
+            token = jwt_req.text
+        self.__s.headers.update({'Authorization': f"Bearer {token}"})
+        self._set_token(token)
+
+    def __ensure_token(self):
+        if self._token_expired():
+            # Concurrent callers wait for a single login instead of each doing their own
+            with self.__token_lock:
+                if self._token_expired():
+                    self.login()
+
+    def __relogin(self, token: str):
+        """Login again unless another caller already replaced the rejected token"""
+        with self.__token_lock:
+            if self.token == token:
+                self.login()
 
     def __auth_req(func):
         def wrapper(self, *args, **kwargs):
+            self.__ensure_token()
+            token = self.token
             try:
                 return func(self, *args, **kwargs)
             except AuthError:
-                self.login()
+                self.__relogin(token)
                 return func(self, *args, **kwargs)
         return wrapper
 
     @__auth_req
-    def __get(self, query: str, params={}, timeout=10) -> dict:
-        """Get request"""
-        url = urljoin(self.url, query)
-        req = self.__s.get(url, timeout=timeout, params=params)
-        self.__check_req(req)
+    def __request(self, method: str, query: str, params=None, data=None, headers=None, timeout=10,
+                  idempotent=False):
+        """Send request, any successful non-GET request invalidates the cache"""
+        send = self.__send_idempotent if idempotent else self.__send
+        req = send(method, self.__base + query.lstrip('/'), params=params, data=data, headers=headers,
+                   timeout=timeout)
+        _check_response(req, req.ok)
+        if method != 'GET':
+            self.clear_cache()
         return req
 
-    @__auth_req
-    def __delete(self, query: str, params={}, timeout=10) -> dict:
+    def __get(self, query: str, params=None, timeout=10) -> dict:
+        """Get request"""
+        return self.__request('GET', query, params=params, timeout=timeout)
+
+    def __delete(self, query: str, params=None, timeout=10) -> dict:
         """Delete request"""
-        url = urljoin(self.url, query)
-        req = self.__s.delete(url, params=params, timeout=timeout)
-        self.__check_req(req)
-        return req
+        return self.__request('DELETE', query, params=params, timeout=timeout)
 
-    @__auth_req
-    def __post(self, query: str, params={}, data={}, timeout=10) -> dict:
-        """Post request"""
-        url = urljoin(self.url, query)
-        req = self.__s.post(url, params=params, data=data,
-                            timeout=timeout)
-        self.__check_req(req)
-        return req
+    def __post(self, query: str, params=None, data=None, timeout=10, idempotent=False) -> dict:
+        """Post request, retried on transient errors only if idempotent"""
+        return self.__request('POST', query, params=params, data=data, timeout=timeout, idempotent=idempotent)
 
-    @__auth_req
-    def __put(self, query: str, params={}, data={}, timeout=10) -> dict:
+    def __put(self, query: str, params=None, data=None, timeout=10) -> dict:
         """Put request"""
-        url = urljoin(self.url, query)
-        req = self.__s.put(url, data=data, params=params, timeout=timeout)
-        self.__check_req(req)
-        return req
+        return self.__request('PUT', query, params=params, data=data, timeout=timeout)
 
-    @__auth_req
-    def __patch(self, query: str, params={}, json={}, timeout=10) -> dict:
-        """Patch request"""
-        url = urljoin(self.url, query)
-        req = self.__s.patch(url, json=json, params=params, timeout=timeout)
-        self.__check_req(req)
-        return req
+    def __patch(self, query: str, params=None, json=None, timeout=10, idempotent=False) -> dict:
+        """Patch request, retried on transient errors only if idempotent"""
+        return self.__request('PATCH', query, params=params, data=json_dumps(json),
+                              headers={'Content-Type': 'application/json'}, timeout=timeout, idempotent=idempotent)
 
-    def update_password(self, new_password: str) -> None:
-        self.__password = new_password
+    def __cached_get(self, query: str, params=None, ttl=0, timeout=10):
+        """Get request with response cached for ttl seconds
+
+        A stale cached response is returned if Reaper can't be reached or answers
+        with 5xx, e.g. while restarting. Raw body is cached and decoded on every
+        call, so callers get objects of their own.
+        """
+        key = _cache_key(query, params)
+        generation, content = self._cache_lookup(key, ttl)
+        if content is None:
+            try:
+                content = self.__get(query, params=params, timeout=timeout).content
+            except (requests.ConnectionError, requests.Timeout, HTTPError) as e:
+                content = self._cache_fallback(key, query, e)
+            else:
+                self._cache_store(key, content, generation)
+        return json_loads(content)
+
+    def __map(self, func, items: list, max_workers=16) -> list:
+        """Call func for every item concurrently, reusing pooled connections"""
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, self.__pool_size, len(items))) as executor:
+            return list(executor.map(func, items))
 
-    def get_clusters(self, timeout=10) -> list:
+    def __bulk(self, func, items: list, max_workers=16) -> None:
+        """Call func for every item concurrently, failed items are reported with BulkError once all are done"""
+        def call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                return e
+        _raise_bulk_errors(items, self.__map(call, items, max_workers))
+
+    def get_clusters(self, timeout=10, cache_ttl=30) -> list:
         """Get list of Cassandra clusters"""
-        req = self.__get('cluster', timeout=timeout)
-        return req.json()
+        return self.__cached_get('cluster', ttl=cache_ttl, timeout=timeout)
 
     def get_cluster_info(self, cluster: str, limit=200, timeout=30) -> dict:
         """Get information about Cassandra cluster"""
-        req = self.__get(f"cluster/{cluster}",
+        req = self.__get(_path(_CLUSTER, cluster),
                          {'limit': limit}, timeout=timeout)
-        return req.json()
+        return json_loads(req.content)
 
-    def get_cluster_tables(self, cluster: str, timeout=10) -> dict:
+    def get_cluster_infos(self, clusters: list, limit=200, max_workers=16, timeout=30) -> dict:
+        """Get information about several Cassandra clusters concurrently"""
+        infos = self.__map(lambda c: self.get_cluster_info(c, limit=limit, timeout=timeout), clusters, max_workers)
+        return dict(zip(clusters, infos))
+
+    def get_cluster_tables(self, cluster: str, timeout=10, cache_ttl=60) -> dict:
         """Get dict of keyspaces and tables list"""
-        req = self.__get(f"cluster/{cluster}/tables", timeout=timeout)
-        return req.json()
+        return self.__cached_get(_path(_CLUSTER_TABLES, cluster), ttl=cache_ttl, timeout=timeout)
 
     def delete_cluster(self, cluster: str, force=False, timeout=10) -> None:
         params = {'force': force}
-        self.__delete(f"cluster/{cluster}", params=params, timeout=timeout)
+        self.__delete(_path(_CLUSTER, cluster), params=params, timeout=timeout)
 
-    def get_repairs(self, cluster='', states=[], timeout=10) -> list:
+    def get_repairs(self, cluster='', states=None, timeout=10) -> list:
         """Get last repairs"""
         params = {}
         if cluster:
@@ -126,66 +446,90 @@ class CassandraReaper:
             states_str = ",".join(states)
             params['state'] = states_str
         req = self.__get('repair_run', params=params, timeout=timeout)
-        return req.json()
+        return json_loads(req.content)
 
     def get_repair(self, id: str, timeout=10) -> dict:
         """Get running repair info"""
-        req = self.__get(f"repair_run/{id}", timeout=timeout)
-        return req.json()
+        req = self.__get(_path(_REPAIR, id), timeout=timeout)
+        return json_loads(req.content)
+
+    def set_repair_state(self, id: str, state: str, timeout=10) -> None:
+        """Set state of repair by id, one of RUNNING, PAUSED or ABORTED"""
+        self.__put(_path(_REPAIR_STATE, id, state), timeout=timeout)
+
+    def set_repair_states(self, ids: list, state: str, max_workers=16, timeout=10) -> None:
+        """Set state of several repairs concurrently, raises BulkError with failed items"""
+        self.__bulk(lambda id: self.set_repair_state(id, state, timeout=timeout), ids, max_workers)
 
     def pause_repair(self, id: str, timeout=10) -> None:
         """Pause running repair by id"""
-        state = 'PAUSED'
-        self.__put(f"/repair_run/{id}/state/{state}", timeout=timeout)
+        self.set_repair_state(id, 'PAUSED', timeout=timeout)
 
     def change_repair_intensity(self, id: str, intensity: float, timeout=10) -> None:
-        self.__put(f"repair_run/{id}/intensity/{intensity}", timeout=timeout)
+        self.__put(_path(_REPAIR_INTENSITY, id, intensity), timeout=timeout)
 
     def resume_repair(self, id: str, timeout=10) -> None:
         """Resume paused repair by id"""
-        state = 'RUNNING'
-        self.__put(f"repair_run/{id}/state/{state}", timeout=timeout)
+        self.set_repair_state(id, 'RUNNING', timeout=timeout)
 
     def abort_repair(self, id: str, timeout=10) -> None:
         """Abort repair by id"""
-        state = 'ABORTED'
-        self.__put(f"repair_run/{id}/state/{state}", timeout=timeout)
+        self.set_repair_state(id, 'ABORTED', timeout=timeout)
+
+    def delete_repair(self, id: str, owner=None, timeout=10) -> None:
+        """Delete repair by id, owner is looked up if not given"""
+        if owner is None:
+            owner = self.get_repair(id, timeout=timeout)['owner']
+        params = {'owner': owner}
+        self.__delete(_path(_REPAIR, id), params=params, timeout=timeout)
 
-    def delete_repair(self, id: str, timeout=10) -> None:
-        """Delete repair by id"""
-        repair = self.get_repair(id)
-        params = {'owner': repair['owner']}
-        self.__delete(f"repair_run/{id}", params=params, timeout=timeout)
+    def delete_repairs(self, ids: list, max_workers=16, timeout=10) -> None:
+        """Delete repairs by ids concurrently looking owners up once, raises BulkError with failed items"""
+        if not ids:
+            return
+        owners = {repair['id']: repair['owner'] for repair in self.get_repairs(timeout=timeout)}
+        self.__bulk(lambda id: self.delete_repair(id, owner=owners.get(id), timeout=timeout), ids, max_workers)
 
     def get_repair_segments(self, id: str, timeout=10) -> list:
         """Get running repair segments"""
-        req = self.__get(f"repair_run/{id}/segments", timeout=timeout)
-        return req.json()
+        req = self.__get(_path(_REPAIR_SEGMENTS, id), timeout=timeout)
+        return json_loads(req.content)
 
     def abort_repair_segment(self, id: str, segment_id: str, timeout=10) -> None:
         """Aborts a running segment and puts it back in NOT_STARTED state. The segment will be processed again later during the lifetime of the repair run."""
         self.__post(
-            f"repair_run/{id}/segments/abort/{segment_id}", timeout=timeout)
+            _path(_REPAIR_SEGMENT_ABORT, id, segment_id), timeout=timeout)
 
-    def get_schedules(self, cluster='', keyspace='', timeout=10) -> list:
+    def abort_repair_segments(self, id: str, segment_ids: list, max_workers=16, timeout=10) -> None:
+        """Abort several running segments of a repair concurrently, raises BulkError with failed items"""
+        self.__bulk(lambda segment_id: self.abort_repair_segment(id, segment_id, timeout=timeout),
+                   segment_ids, max_workers)
+
+    def get_schedules(self, cluster='', keyspace='', timeout=10, cache_ttl=15) -> list:
         """Get repair schedules"""
         params = {}
         if cluster:
             params['clusterName'] = cluster
         if keyspace:
             params['keyspace'] = keyspace
-        req = self.__get('repair_schedule', params=params, timeout=timeout)
-        return req.json()
+        return self.__cached_get('repair_schedule', params=params, ttl=cache_ttl, timeout=timeout)
 
-    def get_cluster_schedules(self, cluster: str, timeout=10) -> list:
+    def get_cluster_schedules(self, cluster: str, timeout=10, cache_ttl=15) -> list:
         """Get repair schedules of a cluster"""
-        req = self.__get(f"repair_schedule/cluster/{cluster}", timeout=timeout)
-        return req.json()
+        return self.__cached_get(_path(_CLUSTER_SCHEDULES, cluster), ttl=cache_ttl, timeout=timeout)
+
+    def set_schedule_state(self, id: str, state: str, timeout=10) -> None:
+        """Set state of repair schedule by id, ACTIVE or PAUSED"""
+        params = {'state': state}
+        self.__put(_path(_SCHEDULE, id), params=params, timeout=timeout)
+
+    def set_schedule_states(self, ids: list, state: str, max_workers=16, timeout=10) -> None:
+        """Set state of several repair schedules concurrently, raises BulkError with failed items"""
+        self.__bulk(lambda id: self.set_schedule_state(id, state, timeout=timeout), ids, max_workers)
 
     def disable_schedule(self, id: str, timeout=10) -> None:
         """Disable repair schedule by id"""
-        params = {'state': 'PAUSED'}
-        self.__put(f"repair_schedule/{id}", params=params, timeout=timeout)
+        self.set_schedule_state(id, 'PAUSED', timeout=timeout)
 
     def add_schedule(
         self,
@@ -197,41 +541,31 @@ class CassandraReaper:
         intensity=0.0,
         repair_parallelism='DATACENTER_AWARE',
         repair_thread_count=1,
-        nodes=[],
-        schedule_trigger_time=datetime.now(timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1),
-        datacenters=[],
-        tables=[],
-        blacklisted_tables=[],
+        nodes=None,
+        schedule_trigger_time=None,
+        datacenters=None,
+        tables=None,
+        blacklisted_tables=None,
         incremental_repair=False,
         adaptive=True,
         percent_unrepaired_threshold=-1,
         timeout=10
     ) -> None:
-        params = {
-            'clusterName': cluster,
-            'keyspace': keyspace,
-            'owner': owner,
-            'scheduleDaysBetween': schedule_days_between,
-            'repairParallelism': repair_parallelism,
-            'incrementalRepair': incremental_repair,
-            'scheduleTriggerTime': schedule_trigger_time.isoformat(),
-            'repairThreadCount': repair_thread_count,
-            'adaptive': adaptive,
-            'percentUnrepairedThreshold': percent_unrepaired_threshold,
-        }
-        if tables:
-            params['tables'] = tables
-        if segment_count_per_node:
-            params['segmentCountPerNode'] = segment_count_per_node
-        if intensity:
-            params['intensity'] = intensity
-        if nodes:
-            params['nodes'] = nodes
-        if datacenters:
-            params['datacenters'] = datacenters
-        if blacklisted_tables:
-            params['blacklistedTables'] = blacklisted_tables
+        params = _schedule_params(
+            cluster, keyspace, owner, schedule_days_between,
+            segment_count_per_node=segment_count_per_node,
+            intensity=intensity,
+            repair_parallelism=repair_parallelism,
+            repair_thread_count=repair_thread_count,
+            nodes=nodes,
+            schedule_trigger_time=schedule_trigger_time,
+            datacenters=datacenters,
+            tables=tables,
+            blacklisted_tables=blacklisted_tables,
+            incremental_repair=incremental_repair,
+            adaptive=adaptive,
+            percent_unrepaired_threshold=percent_unrepaired_threshold,
+        )
         self.__post('repair_schedule', params=params, timeout=timeout)
 
     def update_schedule(
@@ -246,84 +580,533 @@ class CassandraReaper:
         adaptive: bool,
         timeout=10
     ) -> dict:
-        json = {
-            'owner': owner,
-            'repair_parallelism': repair_parallelism,
-            'intensity': intensity,
-            'scheduled_days_between': scheduled_days_between,
-            'segment_count_per_node': segment_count_per_node,
-            'percent_unrepaired_threshold': percent_unrepaired_threshold,
-            'adaptive': adaptive,
-        }
-        req = self.__patch(f"repair_schedule/{id}", json=json, timeout=timeout)
-        return req.json()
-
-    def delete_schedule(self, id: str, timeout=10) -> None:
-        """Delete repair schedule"""
-        schedule = self.get_schedule(id)
-        params = {'owner': schedule['owner']}
-        self.__delete(f"repair_schedule/{id}", params=params, timeout=timeout)
+        json = _schedule_patch_body(owner, repair_parallelism, intensity, scheduled_days_between,
+                                    segment_count_per_node, percent_unrepaired_threshold, adaptive)
+        req = self.__patch(_path(_SCHEDULE, id), json=json, timeout=timeout, idempotent=True)
+        return json_loads(req.content)
+
+    def delete_schedule(self, id: str, owner=None, timeout=10) -> None:
+        """Delete repair schedule, owner is looked up if not given"""
+        if owner is None:
+            owner = self.get_schedule(id, timeout=timeout)['owner']
+        params = {'owner': owner}
+        self.__delete(_path(_SCHEDULE, id), params=params, timeout=timeout)
 
     def enable_schedule(self, id: str, timeout=10) -> None:
         """Enable repair schedule by id"""
-        params = {'state': 'ACTIVE'}
-        self.__put(f"repair_schedule/{id}", params=params, timeout=timeout)
+        self.set_schedule_state(id, 'ACTIVE', timeout=timeout)
 
     def get_schedule(self, id: str, timeout=10) -> dict:
         """Get repair schedule info"""
-        req = self.__get(f"repair_schedule/{id}", timeout=timeout)
-        return req.json()
+        req = self.__get(_path(_SCHEDULE, id), timeout=timeout)
+        return json_loads(req.content)
 
     def start_schedule(self, id: str, timeout=10) -> None:
         """Start repair schedule by id"""
-        self.__post(f"repair_schedule/start/{id}", timeout=timeout)
+        self.__post(_path(_SCHEDULE_START, id), timeout=timeout)
 
     def get_cluster_snapshots(self, cluster: str, timeout=10) -> list:
         """Get cluster snapshots"""
-        req = self.__get(f"/snapshot/cluster/{cluster}", timeout=timeout)
-        return req.json()
+        req = self.__get(_path(_CLUSTER_SNAPSHOTS, cluster), timeout=timeout)
+        return json_loads(req.content)
 
     def get_host_snapshots(self, cluster: str, host: str, timeout=10) -> list:
         """Get snapshots of a host of a cluster"""
-        req = self.__get(f"/snapshot/{cluster}/{host}", timeout=timeout)
-        return req.json()
+        req = self.__get(_path(_HOST_SNAPSHOTS, cluster, host), timeout=timeout)
+        return json_loads(req.content)
 
-    def create_cluster_snapshot(self, cluster: str, snapshot_name: str, owner: str, cause='', keyspace='', tables=[], timeout=10) -> None:
-        """Create a snapshot on all hosts in a cluster, using the same name"""
-        params = {
-            'snapshot_name': snapshot_name,
-            'owner': owner,
-        }
-        if keyspace:
-            params['keyspace'] = keyspace
-        if tables:
-            params['tables'] = ",".join(tables)
-        if cause:
-            params['cause'] = cause
-        self.__post(f"/snapshot/cluster/{cluster}",
-                    params=params, timeout=timeout)
-
-    def create_host_snapshot(self, cluster: str, host: str, snapshot_name: str, owner: str, cause='', keyspace='', tables=[], timeout=10) -> None:
-        """Create a snapshot on a specific host"""
-        params = {
-            'snapshot_name': snapshot_name,
-            'owner': owner,
-        }
-        if keyspace:
-            params['keyspace'] = keyspace
-        if tables:
-            params['tables'] = ",".join(tables)
-        if cause:
-            params['cause'] = cause
-        self.__post(f"/snapshot/{cluster}/{host}",
-                    params=params, timeout=timeout)
+    def create_cluster_snapshot(
+        self,
+        cluster: str,
+        snapshot_name: str,
+        owner: str,
+        cause='',
+        keyspace='',
+        tables=None,
+        timeout=10,
+        idempotent=False
+    ) -> None:
+        """Create a snapshot on all hosts in a cluster, using the same name
+
+        Pass idempotent=True to retry on transient errors, e.g. when snapshot name is unique per attempt.
+        """
+        params = _snapshot_params(snapshot_name, owner, cause, keyspace, tables)
+        self.__post(_path(_CLUSTER_SNAPSHOTS, cluster),
+                    params=params, timeout=timeout, idempotent=idempotent)
+
+    def create_cluster_snapshots(
+        self,
+        clusters: list,
+        snapshot_name: str,
+        owner: str,
+        cause='',
+        keyspace='',
+        tables=None,
+        max_workers=16,
+        timeout=10,
+        idempotent=False
+    ) -> None:
+        """Create a snapshot with the same name on several clusters concurrently, raises BulkError with failed items"""
+        params = _snapshot_params(snapshot_name, owner, cause, keyspace, tables)
+        self.__bulk(lambda c: self.__post(_path(_CLUSTER_SNAPSHOTS, c), params=params, timeout=timeout,
+                                         idempotent=idempotent),
+                   clusters, max_workers)
+
+    def create_host_snapshot(
+        self,
+        cluster: str,
+        host: str,
+        snapshot_name: str,
+        owner: str,
+        cause='',
+        keyspace='',
+        tables=None,
+        timeout=10,
+        idempotent=False
+    ) -> None:
+        """Create a snapshot on a specific host, see create_cluster_snapshot on idempotent"""
+        params = _snapshot_params(snapshot_name, owner, cause, keyspace, tables)
+        self.__post(_path(_HOST_SNAPSHOTS, cluster, host),
+                    params=params, timeout=timeout, idempotent=idempotent)
 
     def delete_cluster_snapshot(self, cluster: str, snapshot_name: str, timeout=10) -> None:
         """Deletes a specific snapshot on all nodes in a given cluster"""
         self.__delete(
-            f"/snapshot/cluster/{cluster}/{snapshot_name}", timeout=timeout)
+            _path(_CLUSTER_SNAPSHOT, cluster, snapshot_name), timeout=timeout)
+
+    def delete_cluster_snapshots(self, clusters: list, snapshot_name: str, max_workers=16, timeout=10) -> None:
+        """Deletes a specific snapshot on several clusters concurrently, raises BulkError with failed items"""
+        self.__bulk(lambda c: self.delete_cluster_snapshot(c, snapshot_name, timeout=timeout), clusters, max_workers)
 
     def delete_host_snapshot(self, cluster: str, host: str, snapshot_name: str, timeout=10) -> None:
         """Deletes a specific snapshot on all nodes in a given cluster"""
         self.__delete(
-            f"/snapshot/{cluster}/{host}/{snapshot_name}", timeout=timeout)
+            _path(_HOST_SNAPSHOT, cluster, host, snapshot_name), timeout=timeout)
+
+
+class AsyncCassandraReaper(_ReaperBase):
+    """Asyncio flavour of CassandraReaper backed by httpx.AsyncClient
+
+    Every endpoint method is a coroutine, so independent calls can be run
+    concurrently with asyncio.gather over a shared connection pool. With
+    http2 concurrent requests are multiplexed over a single connection when
+    Reaper supports it, h2 package is required for that.
+
+    __init__ can't await, so with login=True the client logs in on entering
+    `async with` or right before its first request. Call `await login()` to
+    do it up front, and `aclose()` when not using `async with`.
+    """
+
+    def __init__(self, url: str, user: str, password: str, verify_ssl=True, login=True, http2=True,
+                 pool_size=64) -> None:
+        if httpx is None:
+            msg = "AsyncCassandraReaper requires httpx, install cassandra-reaper-api[async]"
+            raise ImportError(msg)
+        super().__init__(url, user, password)
+        self.__c = httpx.AsyncClient(
+            base_url=url,
+            verify=verify_ssl,
+            http2=http2 and importlib.util.find_spec('h2') is not None,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self.__pool_size = pool_size
+        # Bound method looked up once instead of on every request
+        self.__send = self.__c.request
+        self.__login = login
+        self.__token_lock = None
+
+    async def __aenter__(self) -> 'AsyncCassandraReaper':
+        try:
+            await self.__ensure_token()
+        except BaseException:
+            # __aexit__ isn't called when __aenter__ fails
+            await self.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close underlying connection pool"""
+        await self.__c.aclose()
+
+    async def login(self) -> None:
+        """Get jwt token"""
+        login_req = await self.__c.post('login', data=self._login_data())
+        _check_response(login_req, login_req.is_success)
+        # Newer Reaper versions return the token right away, older ones need a separate request
+        token = _bearer_token(login_req.headers.get('Authorization', ''))
+        if not token:
+            jwt_req = await self.__c.get('jwt')
+            _check_response(jwt_req, jwt_req.is_success)
+            token = jwt_req.text
+        self.__c.headers['Authorization'] = f"Bearer {token}"
+        self._set_token(token)
+
+    def _token_expired(self) -> bool:
+        if not self.token:
+            # Login requested in __init__ is done lazily
+            return self.__login
+        return super()._token_expired()
+
+    def __get_token_lock(self) -> 'asyncio.Lock':
+        # Created on first use so it binds to the running event loop on older Pythons
+        if self.__token_lock is None:
+            self.__token_lock = asyncio.Lock()
+        return self.__token_lock
+
+    async def __ensure_token(self):
+        if self._token_expired():
+            # Concurrent callers wait for a single login instead of each doing their own
+            async with self.__get_token_lock():
+                if self._token_expired():
+                    await self.login()
+
+    async def __relogin(self, token: str):
+        """Login again unless another caller already replaced the rejected token"""
+        async with self.__get_token_lock():
+            if self.token == token:
+                await self.login()
+
+    def __auth_req(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            await self.__ensure_token()
+            token = self.token
+            try:
+                return await func(self, *args, **kwargs)
+            except AuthError:
+                await self.__relogin(token)
+                return await func(self, *args, **kwargs)
+        return wrapper
+
+    @__auth_req
+    async def __request(self, method: str, query: str, params=None, data=None, content=None, headers=None,
+                        timeout=10):
+        """Send request, any successful non-GET request invalidates the cache"""
+        req = await self.__send(method, query, params=params, data=data, content=content, headers=headers,
+                                timeout=timeout)
+        _check_response(req, req.is_success)
+        if method != 'GET':
+            self.clear_cache()
+        return req
+
+    def __get(self, query: str, params=None, timeout=10):
+        """Get request"""
+        return self.__request('GET', query, params=params, timeout=timeout)
+
+    def __delete(self, query: str, params=None, timeout=10):
+        """Delete request"""
+        return self.__request('DELETE', query, params=params, timeout=timeout)
+
+    def __post(self, query: str, params=None, data=None, timeout=10):
+        """Post request"""
+        return self.__request('POST', query, params=params, data=data, timeout=timeout)
+
+    def __put(self, query: str, params=None, data=None, timeout=10):
+        """Put request"""
+        return self.__request('PUT', query, params=params, data=data, timeout=timeout)
+
+    def __patch(self, query: str, params=None, json=None, timeout=10):
+        """Patch request"""
+        return self.__request('PATCH', query, params=params, content=json_dumps(json),
+                              headers={'Content-Type': 'application/json'}, timeout=timeout)
+
+    async def __cached_get(self, query: str, params=None, ttl=0, timeout=10):
+        """Get request with response cached for ttl seconds
+
+        A stale cached response is returned if Reaper can't be reached or answers
+        with 5xx, e.g. while restarting. Raw body is cached and decoded on every
+        call, so callers get objects of their own.
+        """
+        key = _cache_key(query, params)
+        generation, content = self._cache_lookup(key, ttl)
+        if content is None:
+            try:
+                content = (await self.__get(query, params=params, timeout=timeout)).content
+            except (httpx.TransportError, HTTPError) as e:
+                content = self._cache_fallback(key, query, e)
+            else:
+                self._cache_store(key, content, generation)
+        return json_loads(content)
+
+    async def __gather(self, func, items: list, return_exceptions=False) -> list:
+        """Await func for every item concurrently, at most pool_size at once so none wait for a connection"""
+        semaphore = asyncio.Semaphore(self.__pool_size)
+
+        async def call(item):
+            async with semaphore:
+                return await func(item)
+        return await asyncio.gather(*[call(item) for item in items], return_exceptions=return_exceptions)
+
+    async def __bulk(self, func, items: list) -> None:
+        """Await func for every item concurrently, failed items are reported with BulkError once all are done"""
+        _raise_bulk_errors(items, await self.__gather(func, items, return_exceptions=True))
+
+    async def get_clusters(self, timeout=10, cache_ttl=30) -> list:
+        """Get list of Cassandra clusters"""
+        return await self.__cached_get('cluster', ttl=cache_ttl, timeout=timeout)
+
+    async def get_cluster_info(self, cluster: str, limit=200, timeout=30) -> dict:
+        """Get information about Cassandra cluster"""
+        req = await self.__get(_path(_CLUSTER, cluster),
+                               {'limit': limit}, timeout=timeout)
+        return json_loads(req.content)
+
+    async def get_many_cluster_info(self, clusters: list, limit=200, timeout=30) -> list:
+        """Get information about several Cassandra clusters concurrently"""
+        return await self.__gather(lambda c: self.get_cluster_info(c, limit=limit, timeout=timeout), clusters)
+
+    async def get_cluster_infos(self, clusters: list, limit=200, timeout=30) -> dict:
+        """Get information about several Cassandra clusters concurrently, keyed by cluster"""
+        infos = await self.get_many_cluster_info(clusters, limit=limit, timeout=timeout)
+        return dict(zip(clusters, infos))
+
+    async def get_cluster_tables(self, cluster: str, timeout=10, cache_ttl=60) -> dict:
+        """Get dict of keyspaces and tables list"""
+        return await self.__cached_get(_path(_CLUSTER_TABLES, cluster), ttl=cache_ttl, timeout=timeout)
+
+    async def delete_cluster(self, cluster: str, force=False, timeout=10) -> None:
+        params = {'force': force}
+        await self.__delete(_path(_CLUSTER, cluster), params=params, timeout=timeout)
+
+    async def get_repairs(self, cluster='', states=None, timeout=10) -> list:
+        """Get last repairs"""
+        params = {}
+        if cluster:
+            params['cluster_name'] = cluster
+        if states:
+            states_str = ",".join(states)
+            params['state'] = states_str
+        req = await self.__get('repair_run', params=params, timeout=timeout)
+        return json_loads(req.content)
+
+    async def get_repair(self, id: str, timeout=10) -> dict:
+        """Get running repair info"""
+        req = await self.__get(_path(_REPAIR, id), timeout=timeout)
+        return json_loads(req.content)
+
+    async def set_repair_state(self, id: str, state: str, timeout=10) -> None:
+        """Set state of repair by id, one of RUNNING, PAUSED or ABORTED"""
+        await self.__put(_path(_REPAIR_STATE, id, state), timeout=timeout)
+
+    async def set_repair_states(self, ids: list, state: str, timeout=10) -> None:
+        """Set state of several repairs concurrently, raises BulkError with failed items"""
+        await self.__bulk(lambda id: self.set_repair_state(id, state, timeout=timeout), ids)
+
+    async def pause_repair(self, id: str, timeout=10) -> None:
+        """Pause running repair by id"""
+        await self.set_repair_state(id, 'PAUSED', timeout=timeout)
+
+    async def change_repair_intensity(self, id: str, intensity: float, timeout=10) -> None:
+        await self.__put(_path(_REPAIR_INTENSITY, id, intensity), timeout=timeout)
+
+    async def resume_repair(self, id: str, timeout=10) -> None:
+        """Resume paused repair by id"""
+        await self.set_repair_state(id, 'RUNNING', timeout=timeout)
+
+    async def abort_repair(self, id: str, timeout=10) -> None:
+        """Abort repair by id"""
+        await self.set_repair_state(id, 'ABORTED', timeout=timeout)
+
+    async def delete_repair(self, id: str, owner=None, timeout=10) -> None:
+        """Delete repair by id, owner is looked up if not given"""
+        if owner is None:
+            owner = (await self.get_repair(id, timeout=timeout))['owner']
+        params = {'owner': owner}
+        await self.__delete(_path(_REPAIR, id), params=params, timeout=timeout)
+
+    async def delete_repairs(self, ids: list, timeout=10) -> None:
+        """Delete repairs by ids concurrently looking owners up once, raises BulkError with failed items"""
+        if not ids:
+            return
+        owners = {repair['id']: repair['owner'] for repair in await self.get_repairs(timeout=timeout)}
+        await self.__bulk(lambda id: self.delete_repair(id, owner=owners.get(id), timeout=timeout), ids)
+
+    async def get_repair_segments(self, id: str, timeout=10) -> list:
+        """Get running repair segments"""
+        req = await self.__get(_path(_REPAIR_SEGMENTS, id), timeout=timeout)
+        return json_loads(req.content)
+
+    async def abort_repair_segment(self, id: str, segment_id: str, timeout=10) -> None:
+        """Aborts a running segment and puts it back in NOT_STARTED state
+
+        The segment will be processed again later during the lifetime of the repair run.
+        """
+        await self.__post(
+            _path(_REPAIR_SEGMENT_ABORT, id, segment_id), timeout=timeout)
+
+    async def abort_repair_segments(self, id: str, segment_ids: list, timeout=10) -> None:
+        """Abort several running segments of a repair concurrently, raises BulkError with failed items"""
+        await self.__bulk(lambda segment_id: self.abort_repair_segment(id, segment_id, timeout=timeout), segment_ids)
+
+    async def get_schedules(self, cluster='', keyspace='', timeout=10, cache_ttl=15) -> list:
+        """Get repair schedules"""
+        params = {}
+        if cluster:
+            params['clusterName'] = cluster
+        if keyspace:
+            params['keyspace'] = keyspace
+        return await self.__cached_get('repair_schedule', params=params, ttl=cache_ttl, timeout=timeout)
+
+    async def get_cluster_schedules(self, cluster: str, timeout=10, cache_ttl=15) -> list:
+        """Get repair schedules of a cluster"""
+        return await self.__cached_get(_path(_CLUSTER_SCHEDULES, cluster), ttl=cache_ttl, timeout=timeout)
+
+    async def set_schedule_state(self, id: str, state: str, timeout=10) -> None:
+        """Set state of repair schedule by id, ACTIVE or PAUSED"""
+        params = {'state': state}
+        await self.__put(_path(_SCHEDULE, id), params=params, timeout=timeout)
+
+    async def set_schedule_states(self, ids: list, state: str, timeout=10) -> None:
+        """Set state of several repair schedules concurrently, raises BulkError with failed items"""
+        await self.__bulk(lambda id: self.set_schedule_state(id, state, timeout=timeout), ids)
+
+    async def disable_schedule(self, id: str, timeout=10) -> None:
+        """Disable repair schedule by id"""
+        await self.set_schedule_state(id, 'PAUSED', timeout=timeout)
+
+    async def add_schedule(
+        self,
+        cluster: str,
+        keyspace: str,
+        owner: str,
+        schedule_days_between: int,
+        segment_count_per_node=0,
+        intensity=0.0,
+        repair_parallelism='DATACENTER_AWARE',
+        repair_thread_count=1,
+        nodes=None,
+        schedule_trigger_time=None,
+        datacenters=None,
+        tables=None,
+        blacklisted_tables=None,
+        incremental_repair=False,
+        adaptive=True,
+        percent_unrepaired_threshold=-1,
+        timeout=10
+    ) -> None:
+        params = _schedule_params(
+            cluster, keyspace, owner, schedule_days_between,
+            segment_count_per_node=segment_count_per_node,
+            intensity=intensity,
+            repair_parallelism=repair_parallelism,
+            repair_thread_count=repair_thread_count,
+            nodes=nodes,
+            schedule_trigger_time=schedule_trigger_time,
+            datacenters=datacenters,
+            tables=tables,
+            blacklisted_tables=blacklisted_tables,
+            incremental_repair=incremental_repair,
+            adaptive=adaptive,
+            percent_unrepaired_threshold=percent_unrepaired_threshold,
+        )
+        await self.__post('repair_schedule', params=params, timeout=timeout)
+
+    async def update_schedule(
+        self,
+        id: str,
+        owner: str,
+        repair_parallelism: str,
+        intensity: float,
+        scheduled_days_between: int,
+        segment_count_per_node: int,
+        percent_unrepaired_threshold: int,
+        adaptive: bool,
+        timeout=10
+    ) -> dict:
+        json = _schedule_patch_body(owner, repair_parallelism, intensity, scheduled_days_between,
+                                    segment_count_per_node, percent_unrepaired_threshold, adaptive)
+        req = await self.__patch(_path(_SCHEDULE, id), json=json, timeout=timeout)
+        return json_loads(req.content)
+
+    async def delete_schedule(self, id: str, owner=None, timeout=10) -> None:
+        """Delete repair schedule, owner is looked up if not given"""
+        if owner is None:
+            owner = (await self.get_schedule(id, timeout=timeout))['owner']
+        params = {'owner': owner}
+        await self.__delete(_path(_SCHEDULE, id), params=params, timeout=timeout)
+
+    async def enable_schedule(self, id: str, timeout=10) -> None:
+        """Enable repair schedule by id"""
+        await self.set_schedule_state(id, 'ACTIVE', timeout=timeout)
+
+    async def get_schedule(self, id: str, timeout=10) -> dict:
+        """Get repair schedule info"""
+        req = await self.__get(_path(_SCHEDULE, id), timeout=timeout)
+        return json_loads(req.content)
+
+    async def start_schedule(self, id: str, timeout=10) -> None:
+        """Start repair schedule by id"""
+        await self.__post(_path(_SCHEDULE_START, id), timeout=timeout)
+
+    async def get_cluster_snapshots(self, cluster: str, timeout=10) -> list:
+        """Get cluster snapshots"""
+        req = await self.__get(_path(_CLUSTER_SNAPSHOTS, cluster), timeout=timeout)
+        return json_loads(req.content)
+
+    async def get_host_snapshots(self, cluster: str, host: str, timeout=10) -> list:
+        """Get snapshots of a host of a cluster"""
+        req = await self.__get(_path(_HOST_SNAPSHOTS, cluster, host), timeout=timeout)
+        return json_loads(req.content)
+
+    async def create_cluster_snapshot(
+        self,
+        cluster: str,
+        snapshot_name: str,
+        owner: str,
+        cause='',
+        keyspace='',
+        tables=None,
+        timeout=10
+    ) -> None:
+        """Create a snapshot on all hosts in a cluster, using the same name"""
+        params = _snapshot_params(snapshot_name, owner, cause, keyspace, tables)
+        await self.__post(_path(_CLUSTER_SNAPSHOTS, cluster),
+                          params=params, timeout=timeout)
+
+    async def create_cluster_snapshots(
+        self,
+        clusters: list,
+        snapshot_name: str,
+        owner: str,
+        cause='',
+        keyspace='',
+        tables=None,
+        timeout=10
+    ) -> None:
+        """Create a snapshot with the same name on several clusters concurrently, raises BulkError with failed items"""
+        params = _snapshot_params(snapshot_name, owner, cause, keyspace, tables)
+        await self.__bulk(lambda c: self.__post(_path(_CLUSTER_SNAPSHOTS, c), params=params, timeout=timeout), clusters)
+
+    async def create_host_snapshot(
+        self,
+        cluster: str,
+        host: str,
+        snapshot_name: str,
+        owner: str,
+        cause='',
+        keyspace='',
+        tables=None,
+        timeout=10
+    ) -> None:
+        """Create a snapshot on a specific host"""
+        params = _snapshot_params(snapshot_name, owner, cause, keyspace, tables)
+        await self.__post(_path(_HOST_SNAPSHOTS, cluster, host),
+                          params=params, timeout=timeout)
+
+    async def delete_cluster_snapshot(self, cluster: str, snapshot_name: str, timeout=10) -> None:
+        """Deletes a specific snapshot on all nodes in a given cluster"""
+        await self.__delete(
+            _path(_CLUSTER_SNAPSHOT, cluster, snapshot_name), timeout=timeout)
+
+    async def delete_cluster_snapshots(self, clusters: list, snapshot_name: str, timeout=10) -> None:
+        """Deletes a specific snapshot on several clusters concurrently, raises BulkError with failed items"""
+        await self.__bulk(lambda c: self.delete_cluster_snapshot(c, snapshot_name, timeout=timeout), clusters)
+
+    async def delete_host_snapshot(self, cluster: str, host: str, snapshot_name: str, timeout=10) -> None:
+        """Deletes a specific snapshot on all nodes in a given cluster"""
+        await self.__delete(
+            _path(_HOST_SNAPSHOT, cluster, host, snapshot_name), timeout=timeout)
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2023-present Timur Isanov <tisanov@evolution.com>
+#
+# SPDX-License-Identifier: MIT
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+
+def make_jwt(ttl: float) -> str:
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    return f"{encode({'alg': 'HS256'})}.{encode({'sub': 'user', 'exp': time.time() + ttl})}.signature"
+
+
+class FakeReaper:
+    """Minimal Reaper API served with http.server
+
+    Requests are recorded as (method, raw path) tuples, in full as
+    (method, raw path, headers, body) in received. Responses can be
+    queued per method and path, anything else gets 200 with a JSON echo.
+    A queued status of None drops the connection without a response, delay
+    holds the response back for that many seconds.
+    """
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.received = []
+        self.token_ttl = 3600
+        self.__responses = {}
+        self.__lock = threading.Lock()
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), self.__handler())
+        self.url = f"http://127.0.0.1:{self.__server.server_port}/reaper/"
+
+    def respond(self, method: str, path: str, status=200, body=None, headers=None, delay=0) -> None:
+        """Queue a single response for request matching method and path without query"""
+        with self.__lock:
+            self.__responses.setdefault((method, path), []).append((status, body, headers or {}, delay))
+
+    def count(self, method: str, path: str) -> int:
+        """Number of requests matching method and path without query"""
+        return sum(1 for m, p in self.requests if m == method and urlsplit(p).path == path)
+
+    def start(self) -> None:
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def _next_response(self, method: str, raw_path: str, headers, body: bytes):
+        path = urlsplit(raw_path).path
+        with self.__lock:
+            self.requests.append((method, raw_path))
+            self.received.append((method, raw_path, headers, body))
+            queued = self.__responses.get((method, path))
+            if queued:
+                return queued.pop(0)
+        if path == '/reaper/jwt':
+            return 200, make_jwt(self.token_ttl), {}, 0
+        return 200, {'method': method, 'path': raw_path}, {}, 0
+
+    def __handler(self):
+        reaper = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def handle_request(self):
+                content = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status, body, headers, delay = reaper._next_response(self.command, self.path, self.headers, content)
+                time.sleep(delay)
+                if status is None:
+                    self.close_connection = True
+                    return
+                data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Length', str(len(data)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client gave up waiting for a delayed response
+                    self.close_connection = True
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_request
+
+        return Handler
+
+
+@pytest.fixture()
+def reaper_server():
+    server = FakeReaper()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,217 @@
+# SPDX-FileCopyrightText: 2023-present Timur Isanov <tisanov@evolution.com>
+#
+# SPDX-License-Identifier: MIT
+import asyncio
+import importlib.util
+import json
+
+import pytest
+from requests.exceptions import HTTPError
+
+httpx = pytest.importorskip('httpx')
+
+from cassandra_reaper_api import AsyncCassandraReaper, BulkError
+
+
+def run(reaper_server, scenario):
+    async def main():
+        async with AsyncCassandraReaper(reaper_server.url, 'user', 'password', http2=False) as reaper:
+            return await scenario(reaper)
+
+    return asyncio.run(main())
+
+
+def test_login_without_context_manager(reaper_server):
+    async def main():
+        reaper = AsyncCassandraReaper(reaper_server.url, 'user', 'password', http2=False)
+        try:
+            await reaper.get_repair('repair1')
+            await reaper.get_repair('repair1')
+        finally:
+            await reaper.aclose()
+
+    asyncio.run(main())
+    assert reaper_server.count('POST', '/reaper/login') == 1
+    assert reaper_server.count('GET', '/reaper/repair_run/repair1') == 2
+
+
+def test_client_closed_on_failed_login(reaper_server):
+    reaper_server.respond('POST', '/reaper/login', status=500, body='down')
+    reaper = AsyncCassandraReaper(reaper_server.url, 'user', 'password', http2=False)
+
+    async def main():
+        async with reaper:
+            pass
+
+    with pytest.raises(HTTPError):
+        asyncio.run(main())
+    assert reaper._AsyncCassandraReaper__c.is_closed
+
+
+def test_cached_get_hits_cache(reaper_server):
+    async def scenario(reaper):
+        return await reaper.get_clusters(), await reaper.get_clusters()
+
+    first, second = run(reaper_server, scenario)
+    assert first == second
+    assert first is not second
+    assert reaper_server.count('GET', '/reaper/cluster') == 1
+
+
+def test_cached_get_falls_back_to_stale_response_on_server_error_only(reaper_server):
+    reaper_server.respond('GET', '/reaper/cluster', body=['cluster1'])
+    reaper_server.respond('GET', '/reaper/cluster', status=503, body='restarting')
+    reaper_server.respond('GET', '/reaper/cluster', status=404, body='not found')
+
+    async def scenario(reaper):
+        await reaper.get_clusters()
+        assert await reaper.get_clusters(cache_ttl=0) == ['cluster1']
+        with pytest.raises(HTTPError):
+            await reaper.get_clusters(cache_ttl=0)
+
+    run(reaper_server, scenario)
+
+
+def test_write_clears_cache(reaper_server):
+    async def scenario(reaper):
+        await reaper.get_schedules(cluster='cluster1')
+        await reaper.enable_schedule('schedule1')
+        await reaper.get_schedules(cluster='cluster1')
+
+    run(reaper_server, scenario)
+    assert reaper_server.count('GET', '/reaper/repair_schedule') == 2
+
+
+def test_concurrent_callers_share_token_refresh(reaper_server):
+    reaper_server.token_ttl = 1
+
+    async def scenario(reaper):
+        await asyncio.sleep(0.6)
+        await reaper.set_repair_states([f"repair{i}" for i in range(16)], 'PAUSED')
+
+    run(reaper_server, scenario)
+    assert reaper_server.count('POST', '/reaper/login') == 2
+
+
+def test_delete_repairs_looks_up_owners_once(reaper_server):
+    reaper_server.respond('GET', '/reaper/repair_run', body=[{'id': 'repair1', 'owner': 'owner1'}])
+
+    async def scenario(reaper):
+        await reaper.delete_repairs([])
+        await reaper.delete_repairs(['repair1'])
+
+    run(reaper_server, scenario)
+    assert reaper_server.count('GET', '/reaper/repair_run') == 1
+    assert ('DELETE', '/reaper/repair_run/repair1?owner=owner1') in reaper_server.requests
+
+
+def test_fan_out_bounded_by_pool_size(reaper_server):
+    async def main():
+        async with AsyncCassandraReaper(reaper_server.url, 'user', 'password', http2=False, pool_size=4) as reaper:
+            return await reaper.get_cluster_infos([f"cluster{i}" for i in range(100)])
+
+    assert len(asyncio.run(main())) == 100
+
+
+def test_bulk_error_reports_failed_items(reaper_server):
+    reaper_server.respond('DELETE', '/reaper/snapshot/cluster/cluster2/snapshot1', status=404, body='not found')
+
+    async def scenario(reaper):
+        await reaper.delete_cluster_snapshots(['cluster1', 'cluster2', 'cluster3'], 'snapshot1')
+
+    with pytest.raises(BulkError) as e:
+        run(reaper_server, scenario)
+    assert list(e.value.errors) == ['cluster2']
+    assert reaper_server.count('DELETE', '/reaper/snapshot/cluster/cluster3/snapshot1') == 1
+
+
+def test_update_schedule_sends_json_body(reaper_server):
+    async def scenario(reaper):
+        return await reaper.update_schedule('schedule1', 'owner', 'PARALLEL', 0.5, 7, 16, -1, False)
+
+    assert run(reaper_server, scenario) == {'method': 'PATCH', 'path': '/reaper/repair_schedule/schedule1'}
+    method, path, headers, body = reaper_server.received[-1]
+    assert (method, path) == ('PATCH', '/reaper/repair_schedule/schedule1')
+    assert headers['Content-Type'] == 'application/json'
+    assert json.loads(body) == {
+        'owner': 'owner',
+        'repair_parallelism': 'PARALLEL',
+        'intensity': 0.5,
+        'scheduled_days_between': 7,
+        'segment_count_per_node': 16,
+        'percent_unrepaired_threshold': -1,
+        'adaptive': False,
+    }
+
+
+def test_set_repair_states(reaper_server):
+    async def scenario(reaper):
+        await reaper.set_repair_states([f"repair{i}" for i in range(8)], 'RUNNING')
+
+    run(reaper_server, scenario)
+    for i in range(8):
+        assert reaper_server.count('PUT', f"/reaper/repair_run/repair{i}/state/RUNNING") == 1
+
+
+def test_login_takes_token_from_authorization_header(reaper_server):
+    reaper_server.respond('POST', '/reaper/login', headers={'Authorization': 'Bearer token1'})
+
+    async def scenario(reaper):
+        await reaper.get_repair('repair1')
+
+    run(reaper_server, scenario)
+    assert reaper_server.count('GET', '/reaper/jwt') == 0
+    assert reaper_server.received[-1][2]['Authorization'] == 'Bearer token1'
+
+
+def test_path_arguments_quoted(reaper_server):
+    async def scenario(reaper):
+        await reaper.delete_host_snapshot('my cluster', '10.0.0.1', 'a/b?c')
+
+    run(reaper_server, scenario)
+    assert ('DELETE', '/reaper/snapshot/my%20cluster/10.0.0.1/a%2Fb%3Fc') in reaper_server.requests
+
+
+@pytest.fixture()
+def client_kwargs(monkeypatch):
+    kwargs = {}
+
+    class AsyncClient(httpx.AsyncClient):
+        def __init__(self, **kw):
+            kwargs.update(kw)
+            super().__init__(**kw)
+
+    monkeypatch.setattr(httpx, 'AsyncClient', AsyncClient)
+    return kwargs
+
+
+@pytest.mark.parametrize('http2', [True, False])
+def test_http2_flag(reaper_server, client_kwargs, http2):
+    pytest.importorskip('h2')
+
+    async def main():
+        async with AsyncCassandraReaper(reaper_server.url, 'user', 'password', http2=http2) as reaper:
+            await reaper.get_repair('repair1')
+
+    asyncio.run(main())
+    assert client_kwargs['http2'] is http2
+    assert reaper_server.count('GET', '/reaper/repair_run/repair1') == 1
+
+
+def test_http2_disabled_without_h2(client_kwargs, monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None if name == 'h2' else find_spec(name))
+    reaper = AsyncCassandraReaper('http://127.0.0.1/reaper/', 'user', 'password')
+    asyncio.run(reaper.aclose())
+    assert client_kwargs['http2'] is False
+
+
+def test_post_not_retried(reaper_server):
+    reaper_server.respond('POST', '/reaper/snapshot/cluster/cluster1', status=503, body='busy')
+
+    async def scenario(reaper):
+        await reaper.create_cluster_snapshot('cluster1', 'snapshot1', 'owner')
+
+    with pytest.raises(HTTPError):
+        run(reaper_server, scenario)
+    assert reaper_server.count('POST', '/reaper/snapshot/cluster/cluster1') == 1
@@ -0,0 +1,286 @@
+# SPDX-FileCopyrightText: 2023-present Timur Isanov <tisanov@evolution.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from requests.exceptions import HTTPError, ReadTimeout
+
+import cassandra_reaper_api
+from cassandra_reaper_api import BulkError, CassandraReaper
+
+
+@pytest.fixture()
+def reaper(reaper_server):
+    return CassandraReaper(reaper_server.url, 'user', 'password')
+
+
+def test_cached_get_hits_cache(reaper, reaper_server):
+    assert reaper.get_clusters() == reaper.get_clusters()
+    assert reaper_server.count('GET', '/reaper/cluster') == 1
+
+
+def test_cached_get_returns_own_objects(reaper):
+    clusters = reaper.get_clusters()
+    clusters['mutated'] = True
+    assert 'mutated' not in reaper.get_clusters()
+
+
+def test_cached_get_expires(reaper, reaper_server):
+    reaper.get_clusters(cache_ttl=0.05)
+    time.sleep(0.1)
+    reaper.get_clusters(cache_ttl=0.05)
+    assert reaper_server.count('GET', '/reaper/cluster') == 2
+
+
+def test_cached_get_falls_back_to_stale_response(reaper, reaper_server):
+    reaper_server.respond('GET', '/reaper/cluster', body=['cluster1'])
+    reaper_server.respond('GET', '/reaper/cluster', status=500, body='down')
+    assert reaper.get_clusters() == ['cluster1']
+    assert reaper.get_clusters(cache_ttl=0) == ['cluster1']
+    assert reaper_server.count('GET', '/reaper/cluster') == 2
+
+
+def test_cached_get_falls_back_to_stale_response_when_unreachable(reaper, reaper_server):
+    reaper_server.respond('GET', '/reaper/cluster', body=['cluster1'])
+    for _ in range(3):
+        reaper_server.respond('GET', '/reaper/cluster', status=None)
+    assert reaper.get_clusters() == ['cluster1']
+    assert reaper.get_clusters(cache_ttl=0) == ['cluster1']
+    assert reaper_server.count('GET', '/reaper/cluster') == 4
+
+
+def test_cached_get_raises_on_client_error(reaper, reaper_server):
+    reaper_server.respond('GET', '/reaper/cluster/cluster1/tables', body={'keyspace1': ['table1']})
+    reaper_server.respond('GET', '/reaper/cluster/cluster1/tables', status=404, body='not found')
+    reaper.get_cluster_tables('cluster1')
+    with pytest.raises(HTTPError):
+        reaper.get_cluster_tables('cluster1', cache_ttl=0)
+
+
+def test_cached_get_raises_without_stale_response(reaper, reaper_server):
+    reaper_server.respond('GET', '/reaper/cluster', status=500, body='down')
+    with pytest.raises(HTTPError):
+        reaper.get_clusters()
+
+
+def test_write_clears_cache(reaper, reaper_server):
+    reaper.get_schedules(cluster='cluster1')
+    reaper.enable_schedule('schedule1')
+    reaper.get_schedules(cluster='cluster1')
+    assert reaper_server.count('GET', '/reaper/repair_schedule') == 2
+
+
+def test_token_refreshed_before_expiry(reaper_server):
+    reaper_server.token_ttl = 1
+    reaper = CassandraReaper(reaper_server.url, 'user', 'password')
+    reaper.get_repair('repair1')
+    assert reaper_server.count('POST', '/reaper/login') == 1
+    time.sleep(0.6)
+    reaper.get_repair('repair1')
+    assert reaper_server.count('POST', '/reaper/login') == 2
+    assert reaper_server.count('GET', '/reaper/repair_run/repair1') == 2
+
+
+def test_short_lived_token_not_refreshed_on_every_call(reaper_server):
+    reaper_server.token_ttl = 30
+    reaper = CassandraReaper(reaper_server.url, 'user', 'password')
+    for _ in range(5):
+        reaper.get_repair('repair1')
+    assert reaper_server.count('POST', '/reaper/login') == 1
+
+
+def test_token_expired_by_local_clock_not_refreshed(reaper_server):
+    reaper_server.token_ttl = -5
+    reaper = CassandraReaper(reaper_server.url, 'user', 'password')
+    for _ in range(5):
+        reaper.get_repair('repair1')
+    assert reaper_server.count('POST', '/reaper/login') == 1
+
+
+def test_concurrent_callers_share_token_refresh(reaper_server):
+    reaper_server.token_ttl = 1
+    reaper = CassandraReaper(reaper_server.url, 'user', 'password')
+    time.sleep(0.6)
+    reaper.set_repair_states([f"repair{i}" for i in range(16)], 'PAUSED')
+    assert reaper_server.count('POST', '/reaper/login') == 2
+
+
+def test_relogin_on_auth_error(reaper, reaper_server):
+    reaper_server.respond('GET', '/reaper/repair_run/repair1', status=403, body='expired')
+    assert reaper.get_repair('repair1') == {'method': 'GET', 'path': '/reaper/repair_run/repair1'}
+    assert reaper_server.count('POST', '/reaper/login') == 2
+
+
+def test_delete_repairs_looks_up_owners_once(reaper, reaper_server):
+    reaper_server.respond('GET', '/reaper/repair_run', body=[{'id': 'repair1', 'owner': 'owner1'}])
+    reaper_server.respond('GET', '/reaper/repair_run/repair2', body={'id': 'repair2', 'owner': 'owner2'})
+    reaper.delete_repairs(['repair1', 'repair2'])
+    assert reaper_server.count('GET', '/reaper/repair_run') == 1
+    assert ('DELETE', '/reaper/repair_run/repair1?owner=owner1') in reaper_server.requests
+    assert reaper_server.count('GET', '/reaper/repair_run/repair2') == 1
+    assert ('DELETE', '/reaper/repair_run/repair2?owner=owner2') in reaper_server.requests
+
+
+def test_delete_repair_with_owner_skips_lookup(reaper, reaper_server):
+    reaper.delete_repair('repair1', owner='owner1')
+    assert reaper_server.count('GET', '/reaper/repair_run/repair1') == 0
+    assert ('DELETE', '/reaper/repair_run/repair1?owner=owner1') in reaper_server.requests
+
+
+def test_delete_repairs_without_ids_sends_nothing(reaper, reaper_server):
+    reaper.delete_repairs([])
+    assert reaper_server.requests == [('POST', '/reaper/login'), ('GET', '/reaper/jwt')]
+
+
+def test_get_cluster_infos_keyed_by_cluster(reaper, reaper_server):
+    infos = reaper.get_cluster_infos(['cluster1', 'cluster2'])
+    assert infos == {
+        'cluster1': {'method': 'GET', 'path': '/reaper/cluster/cluster1?limit=200'},
+        'cluster2': {'method': 'GET', 'path': '/reaper/cluster/cluster2?limit=200'},
+    }
+
+
+def test_bulk_error_reports_failed_items(reaper, reaper_server):
+    reaper_server.respond('POST', '/reaper/snapshot/cluster/cluster2', status=404, body='not found')
+    with pytest.raises(BulkError) as e:
+        reaper.create_cluster_snapshots(['cluster1', 'cluster2', 'cluster3'], 'snapshot1', 'owner')
+    assert list(e.value.errors) == ['cluster2']
+    assert isinstance(e.value.errors['cluster2'], HTTPError)
+    assert reaper_server.count('POST', '/reaper/snapshot/cluster/cluster3') == 1
+
+
+def test_update_schedule_sends_json_body(reaper, reaper_server):
+    schedule = reaper.update_schedule('schedule1', 'owner', 'PARALLEL', 0.5, 7, 16, -1, False)
+    assert schedule == {'method': 'PATCH', 'path': '/reaper/repair_schedule/schedule1'}
+    method, path, headers, body = reaper_server.received[-1]
+    assert (method, path) == ('PATCH', '/reaper/repair_schedule/schedule1')
+    assert headers['Content-Type'] == 'application/json'
+    assert json.loads(body) == {
+        'owner': 'owner',
+        'repair_parallelism': 'PARALLEL',
+        'intensity': 0.5,
+        'scheduled_days_between': 7,
+        'segment_count_per_node': 16,
+        'percent_unrepaired_threshold': -1,
+        'adaptive': False,
+    }
+
+
+@pytest.mark.parametrize('suffix', ['', '/', '//'])
+def test_base_url_path_kept(reaper_server, suffix):
+    reaper = CassandraReaper(reaper_server.url.rstrip('/') + suffix, 'user', 'password')
+    reaper.get_cluster_snapshots('cluster1')
+    assert reaper_server.requests[0] == ('POST', '/reaper/login')
+    assert reaper_server.count('GET', '/reaper/snapshot/cluster/cluster1') == 1
+
+
+def test_add_schedule_trigger_time_defaults_to_next_midnight_of_call(reaper, reaper_server, monkeypatch):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2030, 1, 2, 13, 30, tzinfo=tz)
+
+    monkeypatch.setattr(cassandra_reaper_api, 'datetime', FrozenDatetime)
+    reaper.add_schedule('cluster1', 'keyspace1', 'owner', 7)
+    method, path = reaper_server.requests[-1]
+    assert method == 'POST'
+    assert parse_qs(urlsplit(path).query)['scheduleTriggerTime'] == ['2030-01-03T00:00:00+00:00']
+
+
+def test_add_schedule_sends_given_trigger_time(reaper, reaper_server):
+    trigger_time = datetime(2030, 5, 6, 7, 8, tzinfo=timezone.utc)
+    reaper.add_schedule('cluster1', 'keyspace1', 'owner', 7, schedule_trigger_time=trigger_time)
+    params = parse_qs(urlsplit(reaper_server.requests[-1][1]).query)
+    assert params['scheduleTriggerTime'] == ['2030-05-06T07:08:00+00:00']
+    assert 'nodes' not in params
+
+
+def test_repair_state_shortcuts(reaper, reaper_server):
+    reaper.pause_repair('repair1')
+    reaper.resume_repair('repair1')
+    reaper.abort_repair('repair1')
+    assert reaper_server.requests[-3:] == [
+        ('PUT', '/reaper/repair_run/repair1/state/PAUSED'),
+        ('PUT', '/reaper/repair_run/repair1/state/RUNNING'),
+        ('PUT', '/reaper/repair_run/repair1/state/ABORTED'),
+    ]
+
+
+def test_set_repair_states_reports_failed_ids(reaper, reaper_server):
+    reaper_server.respond('PUT', '/reaper/repair_run/repair2/state/PAUSED', status=404, body='not found')
+    with pytest.raises(BulkError) as e:
+        reaper.set_repair_states(['repair1', 'repair2', 'repair3'], 'PAUSED')
+    assert list(e.value.errors) == ['repair2']
+    assert reaper_server.count('PUT', '/reaper/repair_run/repair1/state/PAUSED') == 1
+    assert reaper_server.count('PUT', '/reaper/repair_run/repair3/state/PAUSED') == 1
+
+
+def test_login_takes_token_from_authorization_header(reaper_server):
+    reaper_server.respond('POST', '/reaper/login', headers={'Authorization': 'Bearer token1'})
+    reaper = CassandraReaper(reaper_server.url, 'user', 'password')
+    reaper.get_repair('repair1')
+    assert reaper.token == 'token1'
+    assert reaper_server.count('GET', '/reaper/jwt') == 0
+    assert reaper_server.received[-1][2]['Authorization'] == 'Bearer token1'
+
+
+def test_login_falls_back_to_jwt_endpoint(reaper_server):
+    reaper = CassandraReaper(reaper_server.url, 'user', 'password')
+    reaper.get_repair('repair1')
+    assert reaper_server.requests[:2] == [('POST', '/reaper/login'), ('GET', '/reaper/jwt')]
+    assert reaper_server.received[-1][2]['Authorization'] == f"Bearer {reaper.token}"
+
+
+def test_path_arguments_quoted(reaper, reaper_server):
+    reaper.delete_host_snapshot('my cluster', '10.0.0.1', 'a/b?c')
+    reaper.get_cluster_tables('cluster#1')
+    reaper.change_repair_intensity('repair1', 0.5)
+    assert reaper_server.requests[-3:] == [
+        ('DELETE', '/reaper/snapshot/my%20cluster/10.0.0.1/a%2Fb%3Fc'),
+        ('GET', '/reaper/cluster/cluster%231/tables'),
+        ('PUT', '/reaper/repair_run/repair1/intensity/0.5'),
+    ]
+
+
+def test_put_retried_on_gateway_error(reaper, reaper_server):
+    reaper_server.respond('PUT', '/reaper/repair_run/repair1/state/PAUSED', status=503, body='busy')
+    reaper.pause_repair('repair1')
+    assert reaper_server.count('PUT', '/reaper/repair_run/repair1/state/PAUSED') == 2
+
+
+def test_get_retried_on_read_timeout(reaper, reaper_server):
+    for _ in range(3):
+        reaper_server.respond('GET', '/reaper/repair_run/repair1', delay=0.5)
+    with pytest.raises(ReadTimeout):
+        reaper.get_repair('repair1', timeout=0.2)
+    assert reaper_server.count('GET', '/reaper/repair_run/repair1') == 3
+
+
+def test_get_read_timeout_recovers_on_retry(reaper, reaper_server):
+    reaper_server.respond('GET', '/reaper/repair_run/repair1', delay=0.5)
+    assert reaper.get_repair('repair1', timeout=0.2) == {'method': 'GET', 'path': '/reaper/repair_run/repair1'}
+    assert reaper_server.count('GET', '/reaper/repair_run/repair1') == 2
+
+
+def test_delete_not_retried_on_read_timeout(reaper, reaper_server):
+    reaper_server.respond('DELETE', '/reaper/repair_run/repair1', delay=0.5)
+    with pytest.raises(ReadTimeout):
+        reaper.delete_repair('repair1', owner='owner1', timeout=0.2)
+    assert reaper_server.count('DELETE', '/reaper/repair_run/repair1') == 1
+
+
+def test_post_not_retried_by_default(reaper, reaper_server):
+    reaper_server.respond('POST', '/reaper/snapshot/cluster/cluster1', status=503, body='busy')
+    with pytest.raises(HTTPError):
+        reaper.create_cluster_snapshot('cluster1', 'snapshot1', 'owner')
+    assert reaper_server.count('POST', '/reaper/snapshot/cluster/cluster1') == 1
+
+
+def test_idempotent_post_retried(reaper, reaper_server):
+    reaper_server.respond('POST', '/reaper/snapshot/cluster/cluster1', status=503, body='busy')
+    reaper.create_cluster_snapshot('cluster1', 'snapshot1', 'owner', idempotent=True)
+    assert reaper_server.count('POST', '/reaper/snapshot/cluster/cluster1') == 2